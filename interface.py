@@ -10,6 +10,24 @@ class Command(metaclass=abc.ABCMeta):
     This class defines a set of abstract methods for controlling a media
     player.
     '''
+    # minimum time in seconds between two commands
+    delay = 0.7
+
+    def __init__(self):
+        self._last_fire = 0.0
+
+    def _press(self, key):
+        '''
+        Presses the given key unless a command was sent less than `delay`
+        seconds ago. Commands are debounced instead of sleeping so that the
+        caller is never blocked.
+        '''
+        now = time.monotonic()
+        if now - self._last_fire < self.delay:
+            return
+        self._last_fire = now
+        pyautogui.press(key)
+
     def play_pause(self):
         pass
 
@@ -29,24 +47,19 @@ class Command(metaclass=abc.ABCMeta):
 class Youtube(Command):
 
     def play_pause(self):
-        pyautogui.press('Space')
-        time.sleep(0.7)
+        self._press('Space')
 
     def volume_decrease(self):
-        pyautogui.press('Down')
-        time.sleep(0.7)
+        self._press('Down')
 
     def volume_increase(self):
-        pyautogui.press('Up')
-        time.sleep(0.7)
+        self._press('Up')
 
     def forward(self):
-        pyautogui.press('Right')
-        time.sleep(0.7)
+        self._press('Right')
 
     def backward(self):
-        pyautogui.press('Left')
-        time.sleep(0.7)
+        self._press('Left')
 
 
 class MediaPlayerFactory():
@@ -9,18 +9,158 @@ allowing users to control video playback by showing their hand gestures to
 the camera.
 '''
 
+import os
+import sys
+import queue
+import subprocess
 import threading
-import ctypes
-import tkinter as tk
+import warnings
 import cv2
+import numpy as np
 import mediapipe as mp
-from google.protobuf.json_format import MessageToDict
+from mediapipe.python.solution_base import SolutionBase
 import keyboard
 import pyautogui
 import interface
 
 
-finger_tips = [4, 8, 12, 16, 20]
+finger_tips = np.array([4, 8, 12, 16, 20])
+
+# MediaPipe assumes a mirrored (selfie) input, so on an unflipped camera frame
+# it reports the opposite hand
+mirrored_label = {'Left': 'Right', 'Right': 'Left'}
+
+# size (width, height) of the frames given to MediaPipe
+frame_size = (640, 480)
+
+# directory of the application files, so it can be started from anywhere
+app_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+class FrameGrabber(threading.Thread):
+    '''
+    This class reads frames from the camera on a separate thread and keeps
+    only the most recent one, so that hand detection always works on the
+    freshest frame instead of waiting for the camera. Frames that are
+    duplicates of the previous one are dropped, so hand detection is not run
+    twice on the same picture. Frames are shared with readers without being
+    copied, so they must be treated as read-only.
+    '''
+    # step used to subsample frames when looking for duplicates
+    signature_step = 32
+
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.frame = None
+        self.frame_id = 0
+        self.lock = threading.Lock()
+        self.new_frame = threading.Condition(self.lock)
+        self.stopped = False
+
+    def start(self):
+        '''
+        Starts the capture thread.
+
+        :return: the FrameGrabber itself, so it can be created and started in
+        a single line.
+        '''
+        super().start()
+        return self
+
+    def run(self):
+        '''
+        Grabs frames from the camera until the grabber is stopped or the
+        camera stops delivering frames, replacing the previous frame each
+        time a new one arrives.
+        '''
+        step = self.signature_step
+        signature = None
+        try:
+            while not self.stopped and self.cap.isOpened():
+                if not self.cap.grab():
+                    break
+                success, frame = self.cap.retrieve()
+                if not success:
+                    continue
+                # comparing a small subsample is enough to spot repeated
+                # frames
+                new_signature = frame[::step, ::step].copy()
+                if (signature is not None and
+                        np.array_equal(new_signature, signature)):
+                    continue
+                signature = new_signature
+                with self.new_frame:
+                    self.frame = frame
+                    self.frame_id += 1
+                    self.new_frame.notify_all()
+        finally:
+            # wake up readers even if the camera raised an error
+            with self.new_frame:
+                self.stopped = True
+                self.new_frame.notify_all()
+
+    def read(self, last_id=0, timeout=0.1):
+        '''
+        Waits until a frame newer than `last_id` is available and returns it.
+
+        :param last_id: the id of the last frame the caller has processed,
+        defaults to 0 (optional)
+        :param timeout: the maximum time to wait in seconds, defaults to 0.1
+        (optional)
+        :return: the id of the returned frame and the frame itself, or
+        `last_id` and None if no new frame arrived in time. The frame is not
+        copied, since `retrieve()` gives a new array for every frame, so it
+        must not be modified.
+        '''
+        with self.new_frame:
+            self.new_frame.wait_for(
+                lambda: self.frame_id != last_id or self.stopped, timeout)
+            if self.frame_id == last_id:
+                return last_id, None
+            return self.frame_id, self.frame
+
+    def stop(self):
+        '''
+        Stops the capture thread, waits for it to finish and releases the
+        camera.
+        '''
+        self.stopped = True
+        self.join()
+        self.cap.release()
+
+
+def open_camera(index=0, width=frame_size[0], height=frame_size[1], fps=30):
+    '''
+    Opens the camera and configures it for low-latency capture. MJPEG is
+    requested since it is cheaper to ingest than the default raw format, the
+    driver buffer is reduced to a single frame so that every read returns the
+    most recent frame instead of an old queued one, and the resolution is
+    capped since MediaPipe downsamples the input anyway.
+
+    :param index: the index of the camera to open, defaults to 0 (optional)
+    :param width: the requested frame width, defaults to 640 (optional)
+    :param height: the requested frame height, defaults to 480 (optional)
+    :param fps: the requested frame rate, defaults to 30 (optional)
+    :return: the opened cv2.VideoCapture object
+    '''
+    stream = cv2.VideoCapture(index)
+    # Cameras without MJPEG support silently keep their default format.
+    mjpg = cv2.VideoWriter_fourcc(*'MJPG')
+    stream.set(cv2.CAP_PROP_FOURCC, mjpg)
+    properties = ((cv2.CAP_PROP_BUFFERSIZE, 1, 'buffer size'),
+                  (cv2.CAP_PROP_FRAME_WIDTH, width, 'frame width'),
+                  (cv2.CAP_PROP_FRAME_HEIGHT, height, 'frame height'))
+    for prop, value, name in properties:
+        if not stream.set(prop, value):
+            warnings.warn(f'The camera does not support setting the {name}')
+    # some backends reset the format when the size changes
+    if int(stream.get(cv2.CAP_PROP_FOURCC)) != mjpg:
+        stream.set(cv2.CAP_PROP_FOURCC, mjpg)
+    # the frame rate is set last since size and format changes can reset it
+    if not stream.set(cv2.CAP_PROP_FPS, fps):
+        warnings.warn('The camera does not support setting the frame rate')
+    return stream
 
 
 class Screen:
@@ -32,45 +172,72 @@ class Screen:
     '''
     def __init__(self, image):
         self.image = image
+        self.process = None
 
     def show_image(self):
         '''
         Displays the articulation image on the computer screen in a full-screen
-        window for 10 seconds and then closes the window
+        window for 10 seconds and then closes the window. The window runs in a
+        separate process so that its Tk main loop does not compete with the
+        capture loop for the GIL.
+        '''
+        overlay = os.path.join(app_dir, "overlay.py")
+        self.process = subprocess.Popen([sys.executable, overlay, self.image])
+
+    def close_image(self):
+        '''
+        Closes the articulation image window if it is still open.
         '''
-        user32 = ctypes.windll.user32
-        screen_size = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.config(bg="blue", bd=0, highlightthickness=0)
-        root.attributes("-transparentcolor", "#FEFCFD")
-        root.attributes("-topmost", True)
-        tk_image = tk.PhotoImage(file=self.image)
-        canvas_widget = tk.Canvas(
-            root, bg="#FEFCFD", bd=0, highlightthickness=0,
-            width=screen_size[0], height=screen_size[1])
-        canvas_widget.pack()
-        self.image = canvas_widget.create_image(
-            0, 0, image=tk_image, anchor="nw")
-        root.after(10000, root.destroy)
-        root.mainloop()
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
 
     def line_pos(self):
         """
-        The function calculates the position of two lines on the screen based
-        on the screen size.
+        The function gives the position of the two lines of the articulation
+        image, which are drawn at x = 555 and x = 1365 on a 1920 pixels wide
+        screen. The hand landmarks are always in a 640 pixels wide coordinate
+        space regardless of the display resolution, so the screen size cancels
+        out: 555 * 640 / 1920 = 185 and 1365 * 640 / 1920 = 455.
 
         return: the position of two lines on the screen, specifically the
         x-coordinate of the first and second lines, scaled to a resolution of
         640 pixels.
         """
-        user32 = ctypes.windll.user32
-        screen_size = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
-        screen_first_line_x = (screen_size[0]*555)/1920
-        screen_second_line_x = (screen_size[0]*1365)/1920
-        pos_line1 = (screen_first_line_x*640)/screen_size[0]
-        pos_line2 = (screen_second_line_x*640)/screen_size[0]
-        return pos_line1, pos_line2
+        return 185.0, 455.0
+
+
+class LandmarkHands(mp.solutions.hands.Hands):
+    '''
+    MediaPipe Hands without the `multi_hand_world_landmarks` output, which the
+    application never reads. The output stream is left unobserved, so it is
+    not converted to a protobuf message on every frame.
+    '''
+
+    def __init__(self, static_image_mode=False,
+                 max_num_hands=2,
+                 model_complexity=1,
+                 min_detection_confidence=0.5,
+                 min_tracking_confidence=0.5):
+        # Hands.__init__ is bypassed because it always observes all outputs;
+        # the graph and its options are the same as in mp.solutions.hands.
+        # The graph path and calculator option names are mediapipe internals
+        # copied from version 0.9.0, which requirements.txt pins; check them
+        # against mediapipe/python/solutions/hands.py before upgrading.
+        SolutionBase.__init__(
+            self,
+            binary_graph_path=mp.solutions.hands._BINARYPB_FILE_PATH,
+            side_inputs={
+                'model_complexity': model_complexity,
+                'num_hands': max_num_hands,
+                'use_prev_landmarks': not static_image_mode,
+            },
+            calculator_params={
+                'palmdetectioncpu__TensorsToDetectionsCalculator.'
+                'min_score_thresh': min_detection_confidence,
+                'handlandmarkcpu__ThresholdingCalculator.threshold':
+                    min_tracking_confidence,
+            },
+            outputs=['multi_hand_landmarks', 'multi_handedness'])
 
 
 class HandDetection():
@@ -81,10 +248,11 @@ class HandDetection():
     '''
 
     def __init__(self, static_image_mode=False,
-                 max_num_hands=2,
-                 model_complexity=1,
+                 max_num_hands=1,
+                 model_complexity=0,
                  min_detection_confidence=0.6,
-                 min_tracking_confidence=0.6):
+                 min_tracking_confidence=0.6,
+                 use_opencl=False):
         '''
         These parameters are adjustable values that affect the performance of
         hand detection and tracking, and can be tuned to optimize the detection
@@ -95,11 +263,13 @@ class HandDetection():
         defaults to False (optional)
 
         :param max_num_hands: The maximum number of hands to detect in the
-        image or video stream,defaults to 2 (optional)
+        image or video stream, defaults to 1 since only the first detected hand
+        is used for gestures (optional)
 
         :param model_complexity: refers to the complexity of the hand detection
         model used. A higher value means a more complex model, which may result
-        in better accuracy but slower performance, defaults to 1 (optional)
+        in better accuracy but slower performance, defaults to 0 (the lite
+        model) for real-time use (optional)
 
         :param min_detection_confidence: The minimum confidence score required
         for a hand to be detected in the image
@@ -108,39 +278,65 @@ class HandDetection():
         for the hand tracking to be considered successful. If the confidence
         value is lower than this threshold, the hand tracking will be
         considered failed
+
+        :param use_opencl: whether frames that need resizing are resized and
+        converted on the GPU through OpenCV's OpenCL (T-API) path. It only
+        takes effect when OpenCL is available and enabled in OpenCV, defaults
+        to False since frames normally already have the right size (optional)
         '''
         self.static_image_mode = static_image_mode
         self.max_num_hands = max_num_hands
         self.model_complexity = model_complexity
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.use_opencl = (use_opencl and cv2.ocl.haveOpenCL() and
+                           cv2.ocl.useOpenCL())
         # self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(self.static_image_mode,
-                                         self.max_num_hands,
-                                         self.model_complexity,
-                                         self.min_detection_confidence,
-                                         self.min_tracking_confidence)
+        self.hands = LandmarkHands(self.static_image_mode,
+                                   self.max_num_hands,
+                                   self.model_complexity,
+                                   self.min_detection_confidence,
+                                   self.min_tracking_confidence)
         self.result = None
+        # RGB frame reused across calls to avoid allocating a new one per frame
+        self._rgb_buf = None
 
     def find_hands(self, image):
         """
-        This function takes an image, flips it, converts it to RGB, and
-        processes it to detect hands using the Google Mediapipe library and
-        returns the image.
+        This function takes an image, resizes it to `frame_size`, converts it
+        to RGB, and processes it to detect hands using the Google Mediapipe
+        library and returns the image.
 
         :param image: The input image on which the hands are to be detected
         :return: the input image after processing it with the
         `self.hands.process()`method.
         """
 
-        # Flipping the input image ensures that it is consistent with the
-        # original orientation, allowing the hand detection algorithm to
-        # correctly determine the hand type
-        image = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
+        # Resizing first means color conversion touches fewer pixels;
+        # MediaPipe downsamples its input anyway
+        resize = (image.shape[1], image.shape[0]) != frame_size
+        # The image is not flipped here to avoid copying the whole frame;
+        # instead `hand_type` swaps the hand label and `finger_position`
+        # mirrors the x coordinates
+        if resize and self.use_opencl:
+            # both steps run on the GPU and only the result is copied back,
+            # since MediaPipe needs a numpy array; without a resize the
+            # upload and download cost more than the CPU color conversion
+            frame = cv2.resize(cv2.UMat(image), frame_size,
+                               interpolation=cv2.INTER_LINEAR)
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB).get()
+        else:
+            if resize:
+                image = cv2.resize(image, frame_size,
+                                   interpolation=cv2.INTER_LINEAR)
+            if self._rgb_buf is None or self._rgb_buf.shape != image.shape:
+                self._rgb_buf = np.empty_like(image)
+            # the buffer was made read-only for MediaPipe on the last call
+            self._rgb_buf.flags.writeable = True
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB,
+                                 dst=self._rgb_buf)
         image.flags.writeable = False  # to improve performance
         self.result = self.hands.process(image)
-        image.flags.writeable = True
         return image
 
     def hand_type(self):
@@ -149,107 +345,163 @@ class HandDetection():
         hand in an image.
 
         :return: a string that represents the classification label of the hand,
-        which can be "Left" or "Right".
+        which can be "Left" or "Right", or None if no hand was detected.
         '''
-        left_or_right = None
-        if self.result.multi_handedness:
-            for hand_handedness in (self.result.multi_handedness):
-                handedness_dict = MessageToDict(hand_handedness)
-                left_or_right = handedness_dict['classification'][0]['label']
-        return left_or_right
+        if not self.result.multi_handedness:
+            return None
+        # only the first hand is used, and reading the protobuf field directly
+        # is much cheaper than converting the whole message to a dict
+        hand_handedness = self.result.multi_handedness[0]
+        return mirrored_label[hand_handedness.classification[0].label]
 
     def finger_position(self, image):
         """
         This function takes an image and returns a list of finger positions
-        detected inthe image using the MediaPipe library.
+        detected inthe image using the MediaPipe library. The x coordinates
+        are mirrored, as if the image had been flipped horizontally.
 
         :param image: an image (in the form of a numpy array) on which the
         hand landmarks are detected
 
-        :return: A list of finger positions for the first detected hand in the
-        input image. Each finger position is represented as a list containing
-        the finger index (1-20 for fingers and 0 for the palm), and the x and y
-        coordinates of the finger landmark in the image.
-        """
-        position_list = []
-        if self.result.multi_hand_landmarks is not None:
-            my_hand = self.result.multi_hand_landmarks[0]
-            for index, landmarks in enumerate(my_hand.landmark):
-                height, width, = image.shape[0], image.shape[1]
-                coordinate_x, coordinate_y = int(
-                    landmarks.x * width), int(landmarks.y * height)
-                position_list.append([index, coordinate_x, coordinate_y])
-        return position_list
-
-
-class HandGesture():
-    '''This class defines hand commands to control a media player based on
-    the position of the fingers.'''
-
-    def __init__(self, o_pos_lst, lines_pos, label):
-        """
-        This is a class with methods that use hand position data to control
-        media player functions such as play/pause, skip forward/backward, and
-        adjust volume.
-
-        :param o_pos_lst: A list of tuples representing the positions of the
-        fingertips and other landmarks of a hand detected by a hand tracking
-        algorithm
-        :param lines_pos: The position of the lines on the screen that are used
-        as reference points for hand gestures
-        :param label: The label parameter is a string that specifies whether
-        the hand being detected is the left or right hand
+        :return: A (21, 2) integer array of finger positions for the first
+        detected hand in the input image, or None if no hand was detected.
+        Row i holds the x and y coordinates of landmark i in the image (1-20
+        for fingers and 0 for the palm).
         """
-        self.o_pos_lst = o_pos_lst
-        self.lines_pos = lines_pos
-        self.label = label
-
-    def total_fingers_0(self):
+        if self.result.multi_hand_landmarks is None:
+            return None
+        height, width = image.shape[:2]
+        my_hand = self.result.multi_hand_landmarks[0].landmark
+        positions = np.fromiter(
+            (value for landmarks in my_hand
+             for value in (landmarks.x, landmarks.y)),
+            dtype=np.float32, count=2 * len(my_hand)).reshape(-1, 2)
+        positions[:, 0] = 1 - positions[:, 0]
+        positions *= (width, height)
+        return positions.astype(np.int32)
+
+
+class HandTracker(threading.Thread):
+    '''
+    This class runs hand detection on the frames of a FrameGrabber on a
+    separate thread, so that MediaPipe inference overlaps with the gesture
+    commands. The finger positions and hand type of the latest detected hand
+    are kept in a single-slot queue, replacing any result that has not been
+    taken yet. If detection fails, the exception is kept in `error` so that
+    the consumer can report it.
+    '''
+    def __init__(self, grabber, tracking):
+        super().__init__(daemon=True)
+        self.grabber = grabber
+        self.tracking = tracking
+        self.results = queue.Queue(maxsize=1)
+        self.stopped = False
+        self.error = None
+
+    def start(self):
         '''
-        This function checks if the hand gesture shown to the camera is a fist
-        and if the gesture is positioned in the middle of the computer screen.
-        If both conditions are met, it plays or pauses the selected media
-        player.
+        Starts the detection thread.
+
+        :return: the HandTracker itself, so it can be created and started in
+        a single line.
         '''
-        if (self.o_pos_lst[9][1] > self.lines_pos[0] and
-                self.o_pos_lst[9][1] < self.lines_pos[1]):
-            o_media_player.play_pause()
+        super().start()
+        return self
 
-    def total_fingers_1(self):
+    def run(self):
         '''
-        This function only works when all fingers except the index finger touch
-        the palm. If the user shows their right hand to the camera and the hand
-        is on the right side of the screen, it performs the forward function of
-        the media player. Similarly, if the user shows their left hand to the
-        camera and the hand is on the left side of the screen, it performs the
-        backward function of the media player.
+        Detects hands on each new frame until the tracker or the grabber is
+        stopped, and puts the finger positions and the hand type of the
+        detected hand into `results`.
         '''
-        if self.o_pos_lst[8][2] < self.o_pos_lst[6][2]:
-            if (self.o_pos_lst[8][1] < self.lines_pos[0] and
-                    self.label == 'Left'):
-                o_media_player.backward()
-            if (self.o_pos_lst[8][1] > self.lines_pos[1] and
-                    self.label == 'Right'):
-                o_media_player.forward()
-
-    def total_fingers_2(self):
+        frame_id = 0
+        try:
+            while not self.stopped and not self.grabber.stopped:
+                frame_id, image = self.grabber.read(frame_id)
+                if image is None:
+                    continue
+                image = self.tracking.find_hands(image)
+                position_list = self.tracking.finger_position(image)
+                if position_list is None:
+                    continue
+                label = self.tracking.hand_type()
+                # only the latest result is useful, so drop an older one
+                try:
+                    self.results.get_nowait()
+                except queue.Empty:
+                    pass
+                self.results.put_nowait((position_list, label))
+        except Exception as error:
+            self.error = error
+        finally:
+            self.stopped = True
+
+    def stop(self):
         '''
-        This function works only when all fingers except the index and middle
-        fingers touch the palm. If the user shows their right hand to the
-        camera and the hand is on the right side of the screen, it performs
-        the volume up function of the media player. Similarly, if the user
-        shows their left hand to the camera and the hand is on the left side
-        of the screen, it performs the volume down function of the media
-        player.
+        Stops the detection thread and waits for it to finish.
         '''
-        if (self.o_pos_lst[12][2] < self.o_pos_lst[10][2] and
-                self.o_pos_lst[8][2] < self.o_pos_lst[6][2]):
-            if (self.o_pos_lst[9][1] < self.lines_pos[0] and
-                    self.label == 'Left'):
-                o_media_player.volume_decrease()
-            if (self.o_pos_lst[9][1] > self.lines_pos[1] and
-                    self.label == 'Right'):
-                o_media_player.volume_increase()
+        self.stopped = True
+        self.join()
+
+
+# The hand commands below control a media player based on the position of the
+# fingers. Each takes the same arguments:
+#   o_pos_lst: a (21, 2) array holding the x and y positions of the fingertips
+#   and other landmarks of a hand detected by a hand tracking algorithm
+#   lines_pos: the position of the lines on the screen that are used as
+#   reference points for hand gestures
+#   label: a string that specifies whether the hand being detected is the
+#   left or right hand
+
+
+def total_fingers_0(o_pos_lst, lines_pos, label):
+    '''
+    This function checks if the hand gesture shown to the camera is a fist
+    and if the gesture is positioned in the middle of the computer screen.
+    If both conditions are met, it plays or pauses the selected media
+    player.
+    '''
+    if (o_pos_lst[9, 0] > lines_pos[0] and
+            o_pos_lst[9, 0] < lines_pos[1]):
+        o_media_player.play_pause()
+
+
+def total_fingers_1(o_pos_lst, lines_pos, label):
+    '''
+    This function only works when all fingers except the index finger touch
+    the palm. If the user shows their right hand to the camera and the hand
+    is on the right side of the screen, it performs the forward function of
+    the media player. Similarly, if the user shows their left hand to the
+    camera and the hand is on the left side of the screen, it performs the
+    backward function of the media player.
+    '''
+    if o_pos_lst[8, 1] < o_pos_lst[6, 1]:
+        if o_pos_lst[8, 0] < lines_pos[0] and label == 'Left':
+            o_media_player.backward()
+        if o_pos_lst[8, 0] > lines_pos[1] and label == 'Right':
+            o_media_player.forward()
+
+
+def total_fingers_2(o_pos_lst, lines_pos, label):
+    '''
+    This function works only when all fingers except the index and middle
+    fingers touch the palm. If the user shows their right hand to the
+    camera and the hand is on the right side of the screen, it performs
+    the volume up function of the media player. Similarly, if the user
+    shows their left hand to the camera and the hand is on the left side
+    of the screen, it performs the volume down function of the media
+    player.
+    '''
+    if (o_pos_lst[12, 1] < o_pos_lst[10, 1] and
+            o_pos_lst[8, 1] < o_pos_lst[6, 1]):
+        if o_pos_lst[9, 0] < lines_pos[0] and label == 'Left':
+            o_media_player.volume_decrease()
+        if o_pos_lst[9, 0] > lines_pos[1] and label == 'Right':
+            o_media_player.volume_increase()
+
+
+# hand commands indexed by the number of raised fingers
+gestures = (total_fingers_0, total_fingers_1, total_fingers_2)
 
 
 media_player_fac = interface.MediaPlayerFactory()
@@ -263,7 +515,7 @@ def main():
     The main function captures video input, detects hand gestures, and
     performs actions based on the number of fingers detected.
     """
-    articulation = Screen("interface.png")
+    articulation = Screen(os.path.join(app_dir, "interface.png"))
     thread_1 = threading.Timer(3, articulation.show_image)
     thread_1.start()
 
@@ -272,41 +524,44 @@ def main():
 
     pyautogui.FAILSAFE = False
 
-    stream = cv2.VideoCapture(0)
-    tracking = HandDetection()
+    grabber = FrameGrabber(open_camera()).start()
+    # The OpenCL path is only taken for frames that need resizing, which
+    # happens when the camera ignores the requested size; frames that are
+    # already `frame_size` stay on the CPU with the reused RGB buffer
+    tracker = HandTracker(grabber, HandDetection(use_opencl=True)).start()
 
-    while stream.isOpened():
+    # the hook sets the event once instead of polling the keyboard per frame
+    stop_event = threading.Event()
+    quit_hook = keyboard.on_press_key("q", lambda _: stop_event.set())
 
-        success, image = stream.read()
-        if success is False:
-            break
+    while not tracker.stopped:
 
-        if keyboard.is_pressed("q"):
+        if stop_event.is_set():
             break
 
-        image = tracking.find_hands(image)
-        label = tracking.hand_type()
-        o_position_list = tracking.finger_position(image)
-        if len(o_position_list) != 0:
-            fingers = []
-            gesture = HandGesture(o_position_list, lines_pos_x, label)
-            for i in range(1, 5):
-                if (o_position_list[finger_tips[i]][2] <
-                        o_position_list[finger_tips[i]-2][2]):
-                    fingers.append(1)
-                if (o_position_list[finger_tips[i]][2] >
-                        o_position_list[finger_tips[i]-2][2]):
-                    fingers.append(0)
-            total_fingers = fingers.count(1)
-
-            if total_fingers == 0:
-                gesture.total_fingers_0()
-
-            if total_fingers == 1:
-                gesture.total_fingers_1()
-
-            if total_fingers == 2:
-                gesture.total_fingers_2()
+        try:
+            o_position_list, label = tracker.results.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+        # a finger (thumb excluded) is up when its tip is above the joint
+        # two landmarks below it
+        total_fingers = int(
+            (o_position_list[finger_tips[1:], 1] <
+             o_position_list[finger_tips[1:] - 2, 1]).sum())
+        if total_fingers < len(gestures):
+            gestures[total_fingers](o_position_list, lines_pos_x, label)
+
+    keyboard.unhook(quit_hook)
+    thread_1.cancel()
+    thread_1.join()
+    articulation.close_image()
+    tracker.stop()
+    grabber.stop()
+
+    # the detection thread cannot raise into the main thread by itself
+    if tracker.error is not None:
+        raise tracker.error
 
 
 if __name__ == "__main__":
@@ -0,0 +1,39 @@
+'''
+Displays the articulation image that defines how the user will interact with
+the application. It is run as a separate process by the main application so
+that the Tk main loop does not block or slow down the camera capture.
+'''
+
+import sys
+import ctypes
+import tkinter as tk
+
+
+def show_image(image, duration=10000):
+    '''
+    Displays the given image on the computer screen in a full-screen window
+    and closes the window after the given duration.
+
+    :param image: the path of the image to display
+    :param duration: how long the window stays open in milliseconds, defaults
+    to 10000 (optional)
+    '''
+    user32 = ctypes.windll.user32
+    screen_size = user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.config(bg="blue", bd=0, highlightthickness=0)
+    root.attributes("-transparentcolor", "#FEFCFD")
+    root.attributes("-topmost", True)
+    tk_image = tk.PhotoImage(file=image)
+    canvas_widget = tk.Canvas(
+        root, bg="#FEFCFD", bd=0, highlightthickness=0,
+        width=screen_size[0], height=screen_size[1])
+    canvas_widget.pack()
+    canvas_widget.create_image(0, 0, image=tk_image, anchor="nw")
+    root.after(duration, root.destroy)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    show_image(sys.argv[1])